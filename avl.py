@@ -174,12 +174,17 @@ class AVLTree(object):
         return self.search(node.right, key)
 
     def inorder_traversal(self, root):
-        res = []
+        return [f"Order {value.order_id} has been delivered at time {key}" for key, value in self.inorder_items(root)]
+
+    def inorder_items(self, root, items=None):
+        # Collects (key, value) pairs in key order without formatting them
+        if items is None:
+            items = []
         if root:
-            res = self.inorder_traversal(root.left)
-            res.append(f"Order {root.value.order_id} has been delivered at time {root.key}")
-            res = res + self.inorder_traversal(root.right)
-        return res
+            self.inorder_items(root.left, items)
+            items.append((root.key, root.value))
+            self.inorder_items(root.right, items)
+        return items
 
     def get_orders_in_range(self, node, time1, time2):
         # This method collects orders with ETAs within the specified range
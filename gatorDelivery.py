@@ -1,10 +1,12 @@
 import sys
 import re
-from order_management_system import OrderManagementSystem
+from order_management_system import OrderManagementSystem, run_command_records
+from order_records import format_records, print_console
+from schedule_export import SchedulePublisher
 
 
-if len(sys.argv) < 2:
-    print("Usage: python program.py input_file.txt")
+if len(sys.argv) not in (2, 4) or (len(sys.argv) == 4 and sys.argv[2] != "--publish"):
+    print("Usage: python program.py input_file.txt [--publish shared_memory_name]")
     sys.exit(1)
 
 input_file = sys.argv[1]
@@ -12,32 +14,42 @@ output_file = input_file.split('.')[0] + "_output_file.txt"
 
 order_management_system = OrderManagementSystem()
 
+# Other processes can follow the live schedule with schedule_export.ScheduleReader while this runs
+publisher = SchedulePublisher(sys.argv[3]) if len(sys.argv) == 4 else None
+publish_failed = False
+
 with open(input_file, 'r') as f:
     lines = f.readlines()
 
-with open(output_file, 'w') as f:
+# Commands only produce compact records; the text is rendered in bulk when writing the output file
+results = []
+try:
     for line in lines:
         line = line.strip()
         match = re.match(r'(\w+)\((.*?)\)', line)
         if match:
             function_name = match.group(1)
-            if function_name == "Quit":
-                output = order_management_system.quit()
-            else:
-                args = match.group(2).split(',')
-                args = [int(arg.strip()) for arg in args]
-                if function_name == "createOrder":
-                    output = order_management_system.create_order(*args)
-                elif function_name == "cancelOrder":
-                    output = order_management_system.cancel_order(*args)
-                elif function_name == "print":
-                    if len(args) == 2:
-                        output = order_management_system.print_orders(*args)
-                    else:
-                        output = order_management_system.print_order(*args)
-                elif function_name == "getRankOfOrder":
-                    output = order_management_system.get_rank_of_order(*args)
-                elif function_name == "updateTime":
-                    output = order_management_system.update_time(*args)
-
-            f.write('\n'.join(output) + '\n')
\ No newline at end of file
+            args = []
+            if function_name != "Quit":
+                args = [int(arg.strip()) for arg in match.group(2).split(',')]
+            command_records = run_command_records(order_management_system, function_name, args)
+            # Unknown commands repeat the previous command's output, as they always have
+            if command_records is not None:
+                records = command_records
+                print_console(records)
+            results.append(records)
+            if publisher:
+                # Publishing is a side channel, so a schedule that outgrows the segment must not stop the run
+                try:
+                    publisher.publish(order_management_system)
+                except ValueError as e:
+                    if not publish_failed:
+                        print(f"Cannot publish the schedule: {e}", file=sys.stderr)
+                        publish_failed = True
+finally:
+    # Still write the output of the commands that ran if one of them fails
+    with open(output_file, 'w') as f:
+        f.write(''.join('\n'.join(format_records(records)) + '\n' for records in results))
+    if publisher:
+        publisher.close()
+        publisher.unlink()
@@ -1,4 +1,7 @@
 from avl import AVLTree
+from order_records import (CREATED, ETAS_UPDATED, ETA, DELIVERED, CANCELED, CANNOT_CANCEL, CANNOT_UPDATE,
+                           ORDERS_IN_RANGE, IN_RANGE, NO_ORDERS, RANK, ORDER_DETAILS, ORDER_NOT_FOUND,
+                           CANCEL_NOT_FOUND, UPDATE_NOT_FOUND, RANK_NOT_FOUND, format_records, print_console)
 from priority_queue import MaxPriorityQueue
 
 
@@ -26,8 +29,17 @@ class OrderManagementSystem:
         normalized_order_value = order_value / 50
         return value_weight * normalized_order_value - time_weight * current_system_time
 
+    def render_records(self, records):
+        # Prints the stdout messages of the records and returns their output lines
+        print_console(records)
+        return format_records(records)
+
     def create_order(self, order_id, current_system_time, order_value, delivery_time):
-        print_list = []
+        return self.render_records(self.create_order_records(order_id, current_system_time, order_value,
+                                                             delivery_time))
+
+    def create_order_records(self, order_id, current_system_time, order_value, delivery_time):
+        records = []
 
         priority = self.calculate_order_priority(order_value, current_system_time)
         order = Order(order_id, current_system_time, order_value, delivery_time, priority)
@@ -63,13 +75,13 @@ class OrderManagementSystem:
         updated_etas = self.update_lower_priority_orders_eta(priority, order.eta, order.delivery_time,
                                                              current_system_time)
 
-        # Create output string with the format specified
-        print_list.append(f"Order {order_id} has been created - ETA: {order.eta}")
+        records.append((CREATED, order_id, order.eta))
         if updated_etas:
-            print_list.append(f"Updated ETAs: " + ", ".join(f"[{oid}: {new_eta}]" for oid, new_eta in updated_etas))
+            records.append((ETAS_UPDATED, None, None))
+            records += [(ETA, oid, new_eta) for oid, new_eta in updated_etas]
 
-        print_list += self.flush_pq()
-        return print_list
+        records += self.flush_pq_records()
+        return records
 
     def collect_orders_less_than_current_time(self, current_system_time):
         orders_list = []
@@ -81,12 +93,15 @@ class OrderManagementSystem:
             del self.orders[order.order_id]
 
     def flush_pq(self):
-        ret = []
+        return self.render_records(self.flush_pq_records())
+
+    def flush_pq_records(self):
+        records = []
         while not self.pq.is_empty():
             order, _ = self.pq.pop()
-            ret.append(f"Order {order.order_id} has been delivered at time {order.eta}")
+            records.append((DELIVERED, order.order_id, order.eta))
             self.history.append(order)
-        return ret
+        return records
 
     def collect_delivered_orders_from_eta_tree(self, current_system_time, eta_tree, orders_list):
         if eta_tree:
@@ -96,8 +111,12 @@ class OrderManagementSystem:
                 self.collect_delivered_orders_from_eta_tree(current_system_time, eta_tree.right, orders_list)
 
     def deliver_orders(self, current_system_time):
-        # Initialize an empty list to hold strings describing delivered orders
-        delivered_orders_output = []
+        records, last_delivered = self.deliver_orders_records(current_system_time)
+        return self.render_records(records), last_delivered
+
+    def deliver_orders_records(self, current_system_time):
+        # Initialize an empty list to hold records of the delivered orders
+        records = []
         last_delivered = None
 
         # Iterate through orders in the eta_tree to find and deliver orders
@@ -107,9 +126,7 @@ class OrderManagementSystem:
             while current_node and current_node.key <= current_system_time:
                 delivered_order = current_node.value
                 last_delivered = delivered_order
-                delivered_orders_output.append(
-                    f"Order {delivered_order.order_id} has been delivered at time {delivered_order.eta}"
-                )
+                records.append((DELIVERED, delivered_order.order_id, delivered_order.eta))
                 nodes_to_remove.append(current_node.key)
                 current_node = self.eta_tree.get_next_larger_node(current_node.key)
 
@@ -121,20 +138,23 @@ class OrderManagementSystem:
                     self.priority_tree.delete(order_to_remove.value.priority)
                     del self.orders[order_to_remove.value.order_id]
 
-        return delivered_orders_output, last_delivered
+        return records, last_delivered
 
     def cancel_order(self, order_id, current_system_time):
-        ret = []
+        return self.render_records(self.cancel_order_records(order_id, current_system_time))
+
+    def cancel_order_records(self, order_id, current_system_time):
+        records = []
         if order_id not in self.orders:
-            print(f"Cannot cancel. Order {order_id} does not exist.")
-            return ret
+            records.append((CANCEL_NOT_FOUND, order_id, None))
+            return records
 
         order_to_cancel = self.orders[order_id]
 
         # Check if the order is out for delivery or has already been delivered
         if order_to_cancel.eta <= current_system_time or current_system_time > order_to_cancel.eta - order_to_cancel.delivery_time:
-            ret.append(f"Cannot cancel. Order {order_id} has already been delivered or is out for delivery.")
-            return ret
+            records.append((CANNOT_CANCEL, order_id, None))
+            return records
 
         # Collect IDs and old ETAs of all lower priority orders before cancellation
         lower_priority_orders = self.collect_lower_priority_orders(self.priority_tree.root, order_to_cancel.priority,
@@ -143,29 +163,33 @@ class OrderManagementSystem:
         self.priority_tree.delete(order_to_cancel.priority)
         self.eta_tree.delete(order_to_cancel.eta)
         del self.orders[order_id]
-        ret.append(f"Order {order_id} has been canceled")
+        records.append((CANCELED, order_id, None))
 
         for order in lower_priority_orders:
             self.eta_tree.delete(order.eta)
             order.eta -= 2 * order_to_cancel.delivery_time
             self.eta_tree.insert(order.eta, order)
 
-        ret.append(f"Updated ETAs: " + ", ".join(f"[{order.order_id}: {order.eta}]" for order in lower_priority_orders))
-        return ret
+        records.append((ETAS_UPDATED, None, None))
+        records += [(ETA, order.order_id, order.eta) for order in lower_priority_orders]
+        return records
 
     def update_time(self, order_id, current_system_time, new_delivery_time):
-        ret = []
+        return self.render_records(self.update_time_records(order_id, current_system_time, new_delivery_time))
+
+    def update_time_records(self, order_id, current_system_time, new_delivery_time):
+        records = []
 
         if order_id not in self.orders:
-            print(f"Cannot update. Order {order_id} does not exist.")
-            return ret
+            records.append((UPDATE_NOT_FOUND, order_id, None))
+            return records
 
         order_to_update = self.orders[order_id]
 
         # Check if the order has been delivered or is out for delivery
         if order_to_update.eta <= current_system_time:
-            ret.append(f"Cannot update. Order {order_id} has already been delivered.")
-            return ret
+            records.append((CANNOT_UPDATE, order_id, None))
+            return records
 
         # Calculate new priority in case it depends on the time
         new_priority = order_to_update.priority
@@ -189,8 +213,9 @@ class OrderManagementSystem:
                                               current_system_time)
 
         updated_etas.append((order_id, order_to_update.eta))
-        ret.append(f"Updated ETAs: " + ", ".join(f"[{oid}: {new_eta}]" for oid, new_eta in updated_etas))
-        return ret
+        records.append((ETAS_UPDATED, None, None))
+        records += [(ETA, oid, new_eta) for oid, new_eta in updated_etas]
+        return records
 
     def update_lower_priority_orders_eta(self, new_priority, new_order_eta, new_d_t, current_system_time):
         # Initialize a list to hold the updated ETAs
@@ -246,21 +271,27 @@ class OrderManagementSystem:
         return orders
 
     def print_orders(self, time1, time2):
-        ret = []
+        return self.render_records(self.print_orders_records(time1, time2))
+
+    def print_orders_records(self, time1, time2):
+        records = []
         # Retrieve the root of the eta_tree and pass it to the get_orders_in_range function
         orders_in_range = self.eta_tree.get_orders_in_range(self.eta_tree.root, time1, time2)
         if orders_in_range:
-            order_ids = [order.order_id for order in orders_in_range]
-            ret.append(f"Orders to be delivered: {order_ids}")
+            records.append((ORDERS_IN_RANGE, None, None))
+            records += [(IN_RANGE, order.order_id, order.eta) for order in orders_in_range]
         else:
-            ret.append("There are no orders in that time period.")
-        return ret
+            records.append((NO_ORDERS, None, None))
+        return records
 
     def get_rank_of_order(self, order_id):
-        print_list = []
+        return self.render_records(self.get_rank_of_order_records(order_id))
+
+    def get_rank_of_order_records(self, order_id):
+        records = []
         if order_id not in self.orders:
-            print(f"Order {order_id} does not exist.")
-            return print_list
+            records.append((RANK_NOT_FOUND, order_id, None))
+            return records
 
         order = self.orders[order_id]
         priority = order.priority  # Assuming priority is stored in the Order object
@@ -269,22 +300,28 @@ class OrderManagementSystem:
         rank = [0]
         # rank = self.priority_tree.get_rank(priority)
         count = self.eta_tree.get_rank_of_order(self.eta_tree.root, order.eta, rank)
-        print_list.append(f"Order {order_id} will be delivered after {count[0]} orders.")
-        return print_list
+        records.append((RANK, order_id, count[0]))
+        return records
 
     def quit(self):
-        return self.eta_tree.inorder_traversal(self.eta_tree.root)
+        return self.render_records(self.quit_records())
+
+    def quit_records(self):
+        return [(DELIVERED, order.order_id, eta) for eta, order in self.eta_tree.inorder_items(self.eta_tree.root)]
 
     def print_order(self, order_id):
-        ret = []
+        return self.render_records(self.print_order_records(order_id))
+
+    def print_order_records(self, order_id):
+        records = []
         # Check if the order exists in the system
         if order_id in self.orders:
             order = self.orders[order_id]
-            ret.append(
-                f"[{order.order_id}, {order.current_system_time}, {order.order_value}, {order.delivery_time}, {order.eta}]")
+            records.append((ORDER_DETAILS, order.order_id,
+                            (order.current_system_time, order.order_value, order.delivery_time, order.eta)))
         else:
-            ret.append(f"Order {order_id} does not exist.")
-        return ret
+            records.append((ORDER_NOT_FOUND, order_id, None))
+        return records
 
     def find_previous_order(self, order_priority, current_system_time):
         # First, try to find an order being delivered or about to be delivered
@@ -323,3 +360,23 @@ class OrderManagementSystem:
 # Note: The AVLTree class would need to be extended with methods like `get_orders_in_range` and `get_rank`, which
 # require traversal and comparison logic based on the trees' ordering (by priority or ETA).
 # This is a conceptual implementation, assuming such functionality is available or could be implemented in the AVLTree class.
+
+
+def run_command_records(system, function_name, args):
+    # Dispatches one input command to the *_records API of an engine; returns None for unknown commands.
+    # gatorDelivery.py and replay_verifier.py both go through here, so they run the same code path.
+    if function_name == "Quit":
+        return system.quit_records()
+    if function_name == "createOrder":
+        return system.create_order_records(*args)
+    if function_name == "cancelOrder":
+        return system.cancel_order_records(*args)
+    if function_name == "print":
+        if len(args) == 2:
+            return system.print_orders_records(*args)
+        return system.print_order_records(*args)
+    if function_name == "getRankOfOrder":
+        return system.get_rank_of_order_records(*args)
+    if function_name == "updateTime":
+        return system.update_time_records(*args)
+    return None
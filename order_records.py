@@ -0,0 +1,89 @@
+# Compact result records returned by the OrderManagementSystem *_records methods.
+# Every record is a plain (event, order_id, value) tuple. What value holds depends on the event, as listed below;
+# text is only rendered by format_records (output file) and format_console (messages printed to stdout).
+
+CREATED = 0            # (CREATED, order_id, eta)
+ETAS_UPDATED = 1       # (ETAS_UPDATED, None, None), followed by one ETA record per updated order
+ETA = 2                # (ETA, order_id, eta)
+DELIVERED = 3          # (DELIVERED, order_id, delivery time)
+CANCELED = 4           # (CANCELED, order_id, None)
+CANNOT_CANCEL = 5      # (CANNOT_CANCEL, order_id, None)
+CANNOT_UPDATE = 6      # (CANNOT_UPDATE, order_id, None)
+ORDERS_IN_RANGE = 7    # (ORDERS_IN_RANGE, None, None), followed by one IN_RANGE record per order
+IN_RANGE = 8           # (IN_RANGE, order_id, eta)
+NO_ORDERS = 9          # (NO_ORDERS, None, None)
+RANK = 10              # (RANK, order_id, number of orders delivered before it)
+ORDER_DETAILS = 11     # (ORDER_DETAILS, order_id, (current_system_time, order_value, delivery_time, eta))
+ORDER_NOT_FOUND = 12   # (ORDER_NOT_FOUND, order_id, None) from print_order_records
+
+# Unknown order ids for the other commands; these only produce a stdout message, no output line
+CANCEL_NOT_FOUND = 13  # (CANCEL_NOT_FOUND, order_id, None)
+UPDATE_NOT_FOUND = 14  # (UPDATE_NOT_FOUND, order_id, None)
+RANK_NOT_FOUND = 15    # (RANK_NOT_FOUND, order_id, None)
+
+
+def format_records(records):
+    # Renders records into the output lines written by gatorDelivery.py
+    lines = []
+    group = None  # Header event of the multi-order line being collected
+    parts = []
+
+    for event, order_id, value in records:
+        if event == ETA or event == IN_RANGE:
+            parts.append((order_id, value))
+            continue
+        if group is not None:
+            lines.append(_format_group(group, parts))
+            group = None
+            parts = []
+
+        if event == ETAS_UPDATED or event == ORDERS_IN_RANGE:
+            group = event
+        elif event == CREATED:
+            lines.append(f"Order {order_id} has been created - ETA: {value}")
+        elif event == DELIVERED:
+            lines.append(f"Order {order_id} has been delivered at time {value}")
+        elif event == CANCELED:
+            lines.append(f"Order {order_id} has been canceled")
+        elif event == CANNOT_CANCEL:
+            lines.append(f"Cannot cancel. Order {order_id} has already been delivered or is out for delivery.")
+        elif event == CANNOT_UPDATE:
+            lines.append(f"Cannot update. Order {order_id} has already been delivered.")
+        elif event == NO_ORDERS:
+            lines.append("There are no orders in that time period.")
+        elif event == RANK:
+            lines.append(f"Order {order_id} will be delivered after {value} orders.")
+        elif event == ORDER_DETAILS:
+            current_system_time, order_value, delivery_time, eta = value
+            lines.append(f"[{order_id}, {current_system_time}, {order_value}, {delivery_time}, {eta}]")
+        elif event == ORDER_NOT_FOUND:
+            lines.append(f"Order {order_id} does not exist.")
+
+    if group is not None:
+        lines.append(_format_group(group, parts))
+    return lines
+
+
+def format_console(records):
+    # Renders the messages the engine prints to stdout instead of writing them to the output file
+    lines = []
+    for event, order_id, _ in records:
+        if event == CANCEL_NOT_FOUND:
+            lines.append(f"Cannot cancel. Order {order_id} does not exist.")
+        elif event == UPDATE_NOT_FOUND:
+            lines.append(f"Cannot update. Order {order_id} does not exist.")
+        elif event == RANK_NOT_FOUND:
+            lines.append(f"Order {order_id} does not exist.")
+    return lines
+
+
+def print_console(records):
+    for message in format_console(records):
+        print(message)
+
+
+def _format_group(group, parts):
+    if group == ETAS_UPDATED:
+        return f"Updated ETAs: " + ", ".join(f"[{oid}: {eta}]" for oid, eta in parts)
+    order_ids = [oid for oid, _ in parts]
+    return f"Orders to be delivered: {order_ids}"
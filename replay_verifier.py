@@ -0,0 +1,285 @@
+import argparse
+import contextlib
+import copy
+import importlib
+import io
+import random
+import re
+import sys
+import time
+
+from order_management_system import OrderManagementSystem, run_command_records
+from order_records import format_records, print_console
+
+
+COMMAND_PATTERN = re.compile(r'(\w+)\((.*?)\)')
+
+
+class Divergence:
+    def __init__(self, command_index, line_index, command, expected, actual):
+        self.command_index = command_index
+        self.line_index = line_index
+        self.command = command
+        self.expected = expected
+        self.actual = actual
+
+
+class ReplayResult:
+    def __init__(self):
+        self.divergence = None
+        # Index of the command the reference raised on; gatorDelivery.py produces no output after it
+        self.reference_crash = None
+        self.commands_run = 0
+        # Total seconds spent in each engine, keyed by command name
+        self.reference_times = {}
+        self.candidate_times = {}
+        self.counts = {}
+
+    def speedups(self):
+        # Relative speedup of the candidate over the reference per command type
+        ret = {}
+        for name in sorted(self.counts):
+            candidate_time = self.candidate_times[name]
+            ret[name] = self.reference_times[name] / candidate_time if candidate_time > 0 else float('inf')
+        return ret
+
+
+def parse_command(line):
+    # Returns (function_name, args) for a command line, or None for lines gatorDelivery ignores
+    match = COMMAND_PATTERN.match(line.strip())
+    if not match:
+        return None
+    function_name = match.group(1)
+    if function_name == "Quit":
+        return function_name, []
+    args = [int(arg.strip()) for arg in match.group(2).split(',')]
+    return function_name, args
+
+
+def format_command(command):
+    function_name, args = command
+    return f"{function_name}({', '.join(str(arg) for arg in args)})"
+
+
+def run_command(system, command):
+    # Runs the command through the same records dispatch and rendering as gatorDelivery.py
+    function_name, args = command
+    records = run_command_records(system, function_name, args)
+    if records is None:
+        return [f"!Unknown command: {function_name}"]
+    print_console(records)
+    return format_records(records)
+
+
+def load_commands(input_file):
+    with open(input_file, 'r') as f:
+        commands = [parse_command(line) for line in f]
+    return [command for command in commands if command is not None]
+
+
+def is_consistent(system):
+    # The reference keys both trees by ETA and priority, so duplicate keys make later deletes remove the wrong order
+    eta_items = system.eta_tree.inorder_items(system.eta_tree.root)
+    priority_items = system.priority_tree.inorder_items(system.priority_tree.root)
+    if len(eta_items) != len(system.orders) or len(priority_items) != len(system.orders):
+        return False
+    for items in (eta_items, priority_items):
+        if any(items[i][0] >= items[i + 1][0] for i in range(len(items) - 1)):
+            return False
+    return (all(key == order.eta and system.orders.get(order.order_id) is order for key, order in eta_items)
+            and all(key == order.priority and system.orders.get(order.order_id) is order
+                    for key, order in priority_items))
+
+
+def random_command(rng, current_time, next_order_id, order_ids):
+    roll = rng.random()
+    if roll < 0.5 or not order_ids:
+        return "createOrder", [next_order_id, current_time, rng.randint(100, 1000), rng.randint(1, 50)]
+    if roll < 0.6:
+        return "cancelOrder", [rng.choice(order_ids), current_time]
+    if roll < 0.7:
+        return "updateTime", [rng.choice(order_ids), current_time, rng.randint(1, 50)]
+    if roll < 0.8:
+        return "print", [rng.choice(order_ids)]
+    if roll < 0.9:
+        start = rng.randint(0, current_time + 100)
+        return "print", [start, start + rng.randint(0, 200)]
+    return "getRankOfOrder", [rng.choice(order_ids)]
+
+
+def generate_commands(length, seed=None, reference_factory=OrderManagementSystem, max_attempts=50):
+    # Random command stream with a monotonically increasing system time, ending in Quit().
+    # Every command is tried on a copy of the reference first and dropped if it raises or leaves the reference
+    # inconsistent, so the stream exercises defined behaviour only; it ends early if no command fits.
+    rng = random.Random(seed)
+    reference = reference_factory()
+    commands = []
+    order_ids = []
+    current_time = 0
+    next_order_id = 1001
+    for _ in range(length):
+        for _ in range(max_attempts):
+            current_time += rng.randint(1, 20)
+            command = random_command(rng, current_time, next_order_id, order_ids)
+            trial = copy.deepcopy(reference)
+            _, _, crashed = run_captured(trial, command)
+            if not crashed and is_consistent(trial):
+                break
+        else:
+            break
+        reference = trial
+        commands.append(command)
+        if command[0] == "createOrder":
+            order_ids.append(next_order_id)
+            next_order_id += 1
+    commands.append(("Quit", []))
+    return commands
+
+
+def run_captured(system, command):
+    # Runs one command, returning its output lines plus stray stdout lines, the elapsed time and whether it raised
+    stdout = io.StringIO()
+    crashed = False
+    with contextlib.redirect_stdout(stdout):
+        start = time.perf_counter()
+        try:
+            output = run_command(system, command)
+        except Exception as e:
+            output = [f"!{type(e).__name__}: {e}"]
+            crashed = True
+        elapsed = time.perf_counter() - start
+    # The engines report some errors with print(), which is observable behaviour as well
+    return output + [f"stdout: {line}" for line in stdout.getvalue().splitlines()], elapsed, crashed
+
+
+def replay(commands, candidate_factory, reference_factory=OrderManagementSystem):
+    # Runs both engines in lockstep and stops at the first diverging output line
+    result = ReplayResult()
+    reference = reference_factory()
+    candidate = candidate_factory()
+
+    for command_index, command in enumerate(commands):
+        function_name = command[0]
+
+        expected, reference_elapsed, reference_crashed = run_captured(reference, command)
+        actual, candidate_elapsed, _ = run_captured(candidate, command)
+
+        result.commands_run += 1
+        result.counts[function_name] = result.counts.get(function_name, 0) + 1
+        result.reference_times[function_name] = result.reference_times.get(function_name, 0.0) + reference_elapsed
+        result.candidate_times[function_name] = result.candidate_times.get(function_name, 0.0) + candidate_elapsed
+
+        if expected != actual:
+            line_index = 0
+            while line_index < min(len(expected), len(actual)) and expected[line_index] == actual[line_index]:
+                line_index += 1
+            result.divergence = Divergence(command_index, line_index, command, expected, actual)
+            break
+        if reference_crashed:
+            # gatorDelivery.py aborts here, so later commands would only compare undefined state
+            result.reference_crash = command_index
+            break
+
+    return result
+
+
+def reference_is_sound(commands, reference_factory=OrderManagementSystem):
+    # True if the reference runs the commands without raising and stays consistent after each of them
+    reference = reference_factory()
+    for command in commands:
+        _, _, crashed = run_captured(reference, command)
+        if crashed or not is_consistent(reference):
+            return False
+    return True
+
+
+def minimize(commands, candidate_factory, reference_factory=OrderManagementSystem):
+    # Greedily drops chunks of commands while the reduced stream still reproduces the original divergence: same
+    # command type and output line, hit by its last command, with the reference well defined on everything before it
+    divergence = replay(commands, candidate_factory, reference_factory).divergence
+    if divergence is None:
+        return commands
+    commands = commands[:divergence.command_index + 1]
+
+    def reproduces(trial):
+        trial_divergence = replay(trial, candidate_factory, reference_factory).divergence
+        return (trial_divergence is not None
+                and trial_divergence.command_index == len(trial) - 1
+                and trial_divergence.command[0] == divergence.command[0]
+                and trial_divergence.line_index == divergence.line_index
+                and reference_is_sound(trial[:-1], reference_factory))
+
+    chunk_size = max(1, len(commands) // 2)
+    while True:
+        index = 0
+        while index < len(commands):
+            trial = commands[:index] + commands[index + chunk_size:]
+            if trial and reproduces(trial):
+                commands = trial
+            else:
+                index += chunk_size
+        if chunk_size == 1:
+            break
+        chunk_size = max(1, chunk_size // 2)
+    return commands
+
+
+def load_engine(spec):
+    # "module:Class" or just "module", which then has to define OrderManagementSystem
+    module_name, _, class_name = spec.partition(':')
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name or "OrderManagementSystem")
+
+
+def report(result, out=sys.stdout):
+    print(f"Commands replayed: {result.commands_run}", file=out)
+    if result.reference_crash is not None:
+        print(f"  reference raised at command {result.reference_crash + 1}; the rest of the stream was not replayed",
+              file=out)
+    for name, speedup in result.speedups().items():
+        print(f"  {name}: {result.counts[name]} commands, reference {result.reference_times[name]:.6f}s, "
+              f"candidate {result.candidate_times[name]:.6f}s, speedup {speedup:.2f}x", file=out)
+
+
+def report_divergence(divergence, reproducer, out=sys.stdout):
+    print(f"Divergence at command {divergence.command_index + 1}: {format_command(divergence.command)}", file=out)
+    print(f"  output line {divergence.line_index + 1}", file=out)
+    print(f"  expected: {divergence.expected}", file=out)
+    print(f"  actual:   {divergence.actual}", file=out)
+    print(f"Minimized reproducer ({len(reproducer)} commands):", file=out)
+    for command in reproducer:
+        print(format_command(command), file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay commands through the reference and a candidate engine.")
+    parser.add_argument("candidate", help="candidate engine as module:Class")
+    parser.add_argument("input_file", nargs="?", help="command file in gatorDelivery.py format")
+    parser.add_argument("--random", type=int, default=0, metavar="N", help="number of random streams to replay")
+    parser.add_argument("--length", type=int, default=200, help="commands per random stream")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first random stream")
+    options = parser.parse_args(argv)
+
+    if not options.input_file and not options.random:
+        parser.error("give an input file or --random N")
+
+    candidate_factory = load_engine(options.candidate)
+    streams = []
+    if options.input_file:
+        streams.append((options.input_file, load_commands(options.input_file)))
+    for i in range(options.random):
+        seed = options.seed + i
+        streams.append((f"random stream (seed {seed})", generate_commands(options.length, seed)))
+
+    for name, commands in streams:
+        print(f"== {name}")
+        result = replay(commands, candidate_factory)
+        report(result)
+        if result.divergence:
+            report_divergence(result.divergence, minimize(commands, candidate_factory))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# Shared-memory export of the delivery schedule held in OrderManagementSystem.eta_tree.
+#
+# Segment layout:
+#   header  HEADER_SLOTS native-endian int64 values: magic, sequence, capacity, row count of buffer 0, row count of
+#           buffer 1, device and inode of the publisher's resource tracker pipe
+#   buffer 0, buffer 1  capacity little-endian rows of (order_id, eta, delivery_time, priority) each
+#
+# The sequence works as a seqlock. It is odd while the publisher writes a buffer and even once it is published.
+# Publication n (sequence 2n) always lives in buffer n % 2, so the publisher only ever writes the buffer readers are
+# not being pointed at, and a reader never has to lock or wait for the engine.
+# Header slots are accessed through an aligned native int64 view, so every slot is stored and loaded in one piece.
+# Nothing orders those stores between processes beyond the hardware, so the seqlock assumes x86-64's strong memory
+# ordering; readers still bounds-check the row count so a stale value can never produce an out-of-range view.
+
+import os
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+MAGIC = 0x4741544f52534348  # "GATORSCH"
+HEADER_SLOTS = 7
+HEADER_SIZE = HEADER_SLOTS * 8
+MAGIC_SLOT, SEQUENCE_SLOT, CAPACITY_SLOT, COUNT_SLOT, TRACKER_SLOT = 0, 1, 2, 3, 5
+ROW = struct.Struct('<qqqd')  # order_id, eta, delivery_time, priority
+DEFAULT_CAPACITY = 1 << 16
+
+if numpy is not None:
+    ROW_DTYPE = numpy.dtype([('order_id', '<i8'), ('eta', '<i8'), ('delivery_time', '<i8'), ('priority', '<f8')])
+
+
+def _buffer_offset(capacity, buffer_index):
+    return HEADER_SIZE + buffer_index * capacity * ROW.size
+
+
+def _tracker_id():
+    # Identifies this process's resource tracker by its pipe; processes sharing the tracker share the pipe
+    if os.name != 'posix':
+        return 0, 0
+    stat = os.fstat(resource_tracker.getfd())
+    return stat.st_dev, stat.st_ino
+
+
+def _published_sequence(sequence):
+    # While a publication is in progress the previous one is still intact in the other buffer
+    return sequence - 1 if sequence % 2 else sequence
+
+
+class SchedulePublisher:
+    def __init__(self, name=None, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=_buffer_offset(capacity, 2))
+        self.name = self.shm.name
+        self.header = self.shm.buf[:HEADER_SIZE].cast('q')
+        self.header[SEQUENCE_SLOT] = 0
+        self.header[CAPACITY_SLOT] = capacity
+        self.header[COUNT_SLOT] = 0
+        self.header[COUNT_SLOT + 1] = 0
+        self.header[TRACKER_SLOT], self.header[TRACKER_SLOT + 1] = _tracker_id()
+        # Written last so readers never attach to a half initialised segment
+        self.header[MAGIC_SLOT] = MAGIC
+
+    def publish(self, order_management_system):
+        # Call after each command batch; copies the ordered schedule into the buffer readers are not using
+        eta_tree = order_management_system.eta_tree
+        rows = [(order.order_id, eta, order.delivery_time, order.priority)
+                for eta, order in eta_tree.inorder_items(eta_tree.root)]
+        return self.publish_rows(rows)
+
+    def publish_rows(self, rows):
+        if len(rows) > self.capacity:
+            raise ValueError(f"Schedule has {len(rows)} orders but the segment only holds {self.capacity}.")
+
+        sequence = self.header[SEQUENCE_SLOT] + 1
+        buffer_index = (sequence // 2 + 1) % 2
+        self.header[SEQUENCE_SLOT] = sequence
+
+        offset = _buffer_offset(self.capacity, buffer_index)
+        data = b''.join(ROW.pack(*row) for row in rows)
+        self.shm.buf[offset:offset + len(data)] = data
+        self.header[COUNT_SLOT + buffer_index] = len(rows)
+
+        self.header[SEQUENCE_SLOT] = sequence + 1
+        return sequence + 1
+
+    def close(self):
+        self.header.release()
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+class ScheduleReader:
+    def __init__(self, name):
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching registers the segment, which would unlink it when this process exits.
+            # Processes sharing the publisher's tracker (the publisher itself and its multiprocessing children) must
+            # leave that registration alone; all others drop it from their own tracker.
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.header = self.shm.buf[:HEADER_SIZE].cast('q')
+            publisher_tracker = (self.header[TRACKER_SLOT], self.header[TRACKER_SLOT + 1])
+            if os.name == 'posix' and (self.header[MAGIC_SLOT] != MAGIC or publisher_tracker != _tracker_id()):
+                resource_tracker.unregister("/" + self.shm.name, "shared_memory")
+        else:
+            self.header = self.shm.buf[:HEADER_SIZE].cast('q')
+        if self.header[MAGIC_SLOT] != MAGIC:
+            self.close()
+            raise ValueError(f"Shared memory segment {name} does not hold a delivery schedule.")
+        self.capacity = self.header[CAPACITY_SLOT]
+
+    def version(self):
+        # Version of the latest complete publication; 0 until the first one
+        return _published_sequence(self.header[SEQUENCE_SLOT])
+
+    def is_valid(self, version):
+        # A view of a publication stays intact until the publisher starts overwriting its buffer two versions later
+        return self.header[SEQUENCE_SLOT] <= version + 2
+
+    def view(self):
+        # Zero-copy memoryview of the packed rows (see ROW) and its version; check is_valid(version) after use
+        version = self.version()
+        buffer_index = (version // 2) % 2
+        # A count outside the buffer can only come from a publication being rewritten; is_valid rejects it later
+        count = min(max(self.header[COUNT_SLOT + buffer_index], 0), self.capacity)
+        offset = _buffer_offset(self.capacity, buffer_index)
+        rows = self.shm.buf[offset:offset + count * ROW.size]
+        view = rows.toreadonly()
+        rows.release()
+        return version, view
+
+    def as_array(self):
+        # Same as view, but as a read-only NumPy structured array of ROW_DTYPE
+        if numpy is None:
+            raise ImportError("NumPy is required for ScheduleReader.as_array; use view() instead.")
+        version, rows = self.view()
+        array = numpy.frombuffer(rows, dtype=ROW_DTYPE)
+        array.flags.writeable = False
+        return version, array
+
+    def snapshot(self):
+        # Consistent copy of the schedule as a list of (order_id, eta, delivery_time, priority) tuples
+        while True:
+            version, rows = self.view()
+            try:
+                snapshot = list(ROW.iter_unpack(rows))
+            finally:
+                rows.release()
+            if self.is_valid(version):
+                return version, snapshot
+
+    def close(self):
+        # Views handed out by view() or as_array() must be released before closing
+        self.header.release()
+        self.shm.close()
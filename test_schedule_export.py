@@ -0,0 +1,88 @@
+import multiprocessing
+import time
+
+from schedule_export import SchedulePublisher, ScheduleReader
+
+
+STRESS_SECONDS = 2.0
+READERS = 2
+
+
+def rows_for(publication):
+    # Every row of publication n is tagged with n, so a torn or mixed snapshot is easy to spot
+    return [(publication, publication, i, float(publication)) for i in range(publication % 7 + 1)]
+
+
+def check_snapshot(version, rows):
+    if version == 0:
+        return rows == []
+    return version % 2 == 0 and rows == rows_for(version // 2)
+
+
+def read_until_stopped(name, stop, results):
+    reader = ScheduleReader(name)
+    snapshots = errors = 0
+    while not stop.is_set():
+        version, rows = reader.snapshot()
+        snapshots += 1
+        if not check_snapshot(version, rows):
+            errors += 1
+    reader.close()
+    results.put((snapshots, errors))
+
+
+def test_snapshot_round_trip():
+    publisher = SchedulePublisher(capacity=16)
+    try:
+        reader = ScheduleReader(publisher.name)
+        assert reader.snapshot() == (0, [])
+        version = publisher.publish_rows(rows_for(3))
+        assert reader.snapshot() == (version, rows_for(3))
+        reader.close()
+    finally:
+        publisher.close()
+        publisher.unlink()
+
+
+def test_publish_rejects_too_many_rows():
+    publisher = SchedulePublisher(capacity=2)
+    try:
+        try:
+            publisher.publish_rows(rows_for(6))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("publish_rows accepted more rows than the capacity")
+    finally:
+        publisher.close()
+        publisher.unlink()
+
+
+def test_concurrent_snapshots_are_consistent():
+    # Readers in other processes must only ever see complete publications while the publisher keeps writing
+    context = multiprocessing.get_context('spawn')
+    publisher = SchedulePublisher(capacity=8)
+    stop = context.Event()
+    results = context.Queue()
+    readers = [context.Process(target=read_until_stopped, args=(publisher.name, stop, results))
+               for _ in range(READERS)]
+    try:
+        for reader in readers:
+            reader.start()
+        publication = 0
+        deadline = time.monotonic() + STRESS_SECONDS
+        while time.monotonic() < deadline:
+            publication += 1
+            publisher.publish_rows(rows_for(publication))
+        stop.set()
+        totals = [results.get(timeout=30) for _ in readers]
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join(timeout=30)
+        publisher.close()
+        publisher.unlink()
+
+    for snapshots, errors in totals:
+        assert snapshots > 0
+        assert errors == 0